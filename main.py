@@ -1,29 +1,201 @@
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-import os
+from typing import AsyncIterator, List, Optional, Dict, Any, NamedTuple
+import posixpath
+import re
 import asyncio
+import codecs
+import fnmatch
+import functools
 import mimetypes
-import io
 import stat
 import argparse
 import json
+import shlex
 import sys
+import time
 
 # MCP 관련 임포트 (pip로 설치된 패키지 사용)
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
 
 try:
-    import paramiko
+    import asyncssh
 except ImportError:
-    print("paramiko 패키지가 설치되어 있지 않습니다. 다음 명령어로 설치하세요:")
-    print("pip install paramiko")
+    print("asyncssh 패키지가 설치되어 있지 않습니다. 다음 명령어로 설치하세요:")
+    print("pip install asyncssh")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    # orjson이 없으면 표준 json 모듈 사용
+    orjson = None
+
+
+# SFTP 파이프라이닝 설정: 한 채널에서 16KB 블록 요청을 최대 128개까지 동시에 전송
+SFTP_BLOCK_SIZE = 16384
+SFTP_MAX_REQUESTS = 128
+# 한 번에 읽고 쓰는 청크 크기 (파이프라인 한 번을 가득 채우는 크기)
+SFTP_CHUNK_SIZE = SFTP_BLOCK_SIZE * SFTP_MAX_REQUESTS
+
+# remote_read_files에서 동시에 읽는 최대 파일 수
+READ_FILES_CONCURRENCY = 64
+
+# 마지막으로 확인한 항목 수가 이 값 이상인 디렉토리는 SFTP 대신 원격 명령 한 번으로 나열
+EXEC_LISTING_THRESHOLD = 200
+
+# 도구 입력 스키마
+WRITE_FILE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "path": {"type": "string"},
+        "content": {"type": "string"}
+    },
+    "required": ["path", "content"]
+}
+READ_FILES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "paths": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["paths"]
+}
+SEARCH_FILES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "pattern": {"type": "string"},
+        "path": {"type": "string"}
+    },
+    "required": ["pattern"]
+}
+LIST_DIRECTORY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "path": {"type": "string"}
+    }
+}
+EXECUTE_COMMAND_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "command": {"type": "string"}
+    },
+    "required": ["command"]
+}
+
+# 도구 응답 문구
+NO_MATCHING_FILES_TEXT = "일치하는 파일이 없습니다."
+EMPTY_DIRECTORY_TEXT = "디렉토리가 비어있거나 접근할 수 없습니다."
+
+# 확장자 -> MIME 타입 (시스템 MIME 데이터베이스를 불러온 뒤 한 번만 복사하므로
+# 해당 호스트에서 mimetypes.guess_type이 돌려주는 값과 같음).
+# guess_type이 먼저 벗겨내는 압축/별칭 확장자(.gz, .tgz 등)는 제외하여 mimetypes로 넘김
+mimetypes.init()
+_EXT_MIME_TYPES = {
+    ext: mime_type for ext, mime_type in mimetypes.types_map.items()
+    if ext not in mimetypes.suffix_map and ext not in mimetypes.encodings_map
+}
+
+# find -printf '%y' 파일 형식 문자 -> stat 모드 비트
+_FIND_TYPE_BITS = {
+    'f': stat.S_IFREG,
+    'd': stat.S_IFDIR,
+    'l': stat.S_IFLNK,
+    'p': stat.S_IFIFO,
+    's': stat.S_IFSOCK,
+    'c': stat.S_IFCHR,
+    'b': stat.S_IFBLK,
+}
+
+
+def _guess_mime_type(name: str) -> str:
+    """파일 이름으로 MIME 타입 추측 (확장자 사전 조회, 압축 확장자 등은 mimetypes로 처리)"""
+    dot = name.rfind('.')
+    if dot > 0:
+        mime_type = _EXT_MIME_TYPES.get(name[dot:].lower())
+        if mime_type is not None:
+            return mime_type
+    return mimetypes.guess_type(name)[0] or "text/plain"
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_name_pattern(pattern: str) -> re.Pattern:
+    """find -name '*pattern*'과 같은 의미의 정규식 컴파일 (결과를 캐시)"""
+    return re.compile(fnmatch.translate(f'*{pattern}*'))
+
+
+class PooledConnection(NamedTuple):
+    """풀에 보관되는 SSH 연결과 해당 연결 위의 SFTP 클라이언트"""
+    conn: asyncssh.SSHClientConnection
+    sftp: asyncssh.SFTPClient
+
+
+class ConnectionPool:
+    def __init__(self, connect_kwargs: Dict[str, Any], size: int = 4, keepalive_interval: int = 30):
+        """
+        SSH 연결 풀 초기화 (OpenSSH ControlMaster/ControlPersist 방식)
+        
+        Args:
+            connect_kwargs: asyncssh.connect에 전달할 연결 인자
+            size: 유지할 연결 수 (기본값: 4)
+            keepalive_interval: keepalive 전송 간격(초) (기본값: 30)
+        """
+        self._connect_kwargs = dict(connect_kwargs, keepalive_interval=keepalive_interval)
+        self._slots: List[Optional[PooledConnection]] = [None] * size
+        self._locks = [asyncio.Lock() for _ in range(size)]
+        self._next = 0
+    
+    async def acquire(self) -> PooledConnection:
+        """라운드 로빈으로 연결을 선택하고, 끊어진 연결은 다시 연결"""
+        index = self._next
+        self._next = (index + 1) % len(self._slots)
+        
+        # 살아 있는 연결은 잠금 없이 바로 반환
+        slot = self._slots[index]
+        if slot is not None and not slot.conn.is_closed():
+            return slot
+        
+        async with self._locks[index]:
+            # 잠금을 기다리는 동안 다른 작업이 이미 다시 연결했을 수 있음
+            slot = self._slots[index]
+            if slot is None or slot.conn.is_closed():
+                slot = await self._open()
+                self._slots[index] = slot
+            return slot
+    
+    async def _open(self) -> PooledConnection:
+        """새 SSH 연결과 SFTP 클라이언트 생성"""
+        try:
+            conn = await asyncssh.connect(**self._connect_kwargs)
+        except Exception as e:
+            print(f"SSH 연결 실패: {str(e)}", file=sys.stderr)
+            raise
+        
+        try:
+            # SFTP 클라이언트 생성 (하나의 채널에서 여러 요청을 파이프라이닝)
+            sftp = await conn.start_sftp_client()
+        except Exception:
+            conn.close()
+            raise
+        
+        print(f"원격 서버 {self._connect_kwargs['host']}에 성공적으로 연결되었습니다.", file=sys.stderr)
+        return PooledConnection(conn, sftp)
+    
+    async def close(self):
+        """풀의 모든 SSH 및 SFTP 연결 종료"""
+        for index, slot in enumerate(self._slots):
+            if slot is None:
+                continue
+            
+            slot.sftp.exit()
+            slot.conn.close()
+            await slot.conn.wait_closed()
+            self._slots[index] = None
+
 
 class RemoteSSHFileSystemManager:
     def __init__(self, hostname: str, port: int = 22, username: str = None, 
-                 password: str = None, key_filename: str = None, base_path: str = "/"):
+                 password: str = None, key_filename: str = None, base_path: str = "/",
+                 pool_size: int = 4, cache_ttl: float = 30.0):
         """
         SSH 파일 시스템 관리자 초기화
         
@@ -34,6 +206,8 @@ class RemoteSSHFileSystemManager:
             password: SSH 비밀번호 (키 파일 또는 비밀번호 중 하나는 필요)
             key_filename: SSH 키 파일 경로 (키 파일 또는 비밀번호 중 하나는 필요)
             base_path: 기본 작업 디렉토리 (기본값: /)
+            pool_size: 유지할 SSH 연결 수 (기본값: 4)
+            cache_ttl: 디렉토리 메타데이터 캐시 유효 시간(초) (기본값: 30)
         """
         self.hostname = hostname
         self.port = port
@@ -41,187 +215,401 @@ class RemoteSSHFileSystemManager:
         self.password = password
         self.key_filename = key_filename
         self.base_path = Path(base_path)
-        self._ssh_client = None
-        self._sftp_client = None
-    
-    async def remote_connect(self):
-        """SSH 및 SFTP 연결 설정"""
-        if self._ssh_client is not None and self._ssh_client.get_transport() and self._ssh_client.get_transport().is_active():
-            return
-
-        # 비동기로 SSH 연결 생성
-        self._ssh_client = await asyncio.to_thread(paramiko.SSHClient)
-        self._ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self._base_norm = Path(posixpath.normpath(base_path))
+        self._base_str = str(self._base_norm)
         
-        # SSH 서버에 연결
         connect_kwargs = {
-            'hostname': self.hostname,
+            'host': self.hostname,
             'port': self.port,
-            'username': self.username
+            'username': self.username,
+            # paramiko의 AutoAddPolicy와 동일하게 호스트 키 검증을 하지 않음
+            'known_hosts': None
         }
         
         if self.password:
             connect_kwargs['password'] = self.password
         if self.key_filename:
-            connect_kwargs['key_filename'] = self.key_filename
-            
-        try:
-            await asyncio.to_thread(self._ssh_client.connect, **connect_kwargs)
-            # SFTP 클라이언트 생성
-            self._sftp_client = await asyncio.to_thread(self._ssh_client.open_sftp)
-            print(f"원격 서버 {self.hostname}에 성공적으로 연결되었습니다.")
-        except Exception as e:
-            print(f"SSH 연결 실패: {str(e)}")
-            raise
+            # 키 파일 읽기와 파싱은 동기 작업이므로 연결마다 이벤트 루프에서 반복하지 않도록
+            # 시작 시 한 번만 불러와 풀의 모든 연결이 공유
+            # (paramiko와 같이 비밀번호는 암호화된 키 파일의 암호로도 사용)
+            connect_kwargs['client_keys'] = asyncssh.load_keypairs(self.key_filename,
+                                                                   passphrase=self.password)
+        
+        self._pool = ConnectionPool(connect_kwargs, size=pool_size)
+        
+        # 디렉토리 목록 캐시 (절대 경로 -> (저장 시각, 항목 목록))
+        self._cache_ttl = cache_ttl
+        self._dir_cache: Dict[str, tuple[float, list]] = {}
+        # 마지막으로 나열했을 때의 디렉토리 항목 수 (캐시가 만료되어도 유지)
+        self._dir_sizes: Dict[str, int] = {}
+        # remote_directory_mtime으로 마지막으로 확인한 디렉토리 수정 시각
+        self._dir_mtimes: Dict[str, int] = {}
+        self._cache_lock = asyncio.Lock()
+    
+    async def remote_connect(self) -> PooledConnection:
+        """풀에서 SSH 및 SFTP 연결 획득"""
+        return await self._pool.acquire()
     
     async def remote_close(self):
         """SSH 및 SFTP 연결 종료"""
-        if self._sftp_client:
-            await asyncio.to_thread(self._sftp_client.close)
-            self._sftp_client = None
+        await self._pool.close()
+    
+    async def _get_cached_dir(self, dir_path: str) -> Optional[list]:
+        """캐시된 디렉토리 항목 조회 (만료되었으면 None)"""
+        async with self._cache_lock:
+            cached = self._dir_cache.get(dir_path)
+            if cached is None:
+                return None
             
-        if self._ssh_client:
-            await asyncio.to_thread(self._ssh_client.close)
-            self._ssh_client = None
+            timestamp, entries = cached
+            if time.monotonic() - timestamp >= self._cache_ttl:
+                del self._dir_cache[dir_path]
+                return None
+            return entries
+    
+    async def _store_dir(self, dir_path: str, entries: list) -> None:
+        """디렉토리 항목을 캐시에 저장"""
+        async with self._cache_lock:
+            self._dir_cache[dir_path] = (time.monotonic(), entries)
+            self._dir_sizes[dir_path] = len(entries)
+    
+    async def _invalidate_path(self, file_path: str) -> None:
+        """변경된 파일의 상위 디렉토리 캐시 항목 제거"""
+        async with self._cache_lock:
+            self._dir_cache.pop(posixpath.dirname(file_path), None)
+    
+    async def _invalidate_all(self) -> None:
+        """모든 캐시 항목 제거"""
+        async with self._cache_lock:
+            self._dir_cache.clear()
     
     def _validate_path(self, path: str | Path) -> Path:
         """주어진 경로가 base_path 내에 있는지 확인"""
-        if isinstance(path, str):
-            # 경로 정규화
-            norm_path = os.path.normpath(path)
-            full_path = Path(self.base_path) / norm_path if not path.startswith('/') else Path(path)
+        # 원격 경로이므로 로컬 파일 시스템을 참조하는 resolve() 대신 문자열 기준으로 정규화
+        if isinstance(path, str) and not path.startswith('/'):
+            full_path = Path(posixpath.normpath(posixpath.join(self._base_str, path)))
         else:
-            full_path = path
+            full_path = Path(posixpath.normpath(path))
             
-        # 기본 경로 하위에 있는지 확인
-        base_str = str(self.base_path)
-        path_str = str(full_path)
-        if not path_str.startswith(base_str):
+        # 기본 경로 하위에 있는지 경로 구성 요소 단위로 확인 (/base_evil은 /base 하위가 아님)
+        if not full_path.is_relative_to(self._base_norm):
             raise ValueError(f"Invalid path: Access denied. Path must be within {self.base_path}")
             
         return full_path
     
-    async def remote_read_file(self, path: str) -> tuple[str, str]:
-        """원격 파일 읽기"""
-        await self.remote_connect()
+    async def remote_read_file(self, path: str, max_requests: int = SFTP_MAX_REQUESTS) -> tuple[str, str]:
+        """원격 파일 읽기 (max_requests: 동시에 보낼 최대 READ 요청 수)"""
+        client = await self.remote_connect()
         full_path = self._validate_path(path)
         
         try:
-            # 원격 파일을 임시 메모리 객체로 읽기
-            with io.BytesIO() as temp_file:
-                await asyncio.to_thread(self._sftp_client.getfo, str(full_path), temp_file)
-                temp_file.seek(0)
-                content = temp_file.read().decode('utf-8')
+            # 파이프라이닝된 블록 요청으로 EOF까지 청크 단위로 읽으면서 점진적으로 디코딩
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            parts = []
+            async with client.sftp.open(str(full_path), 'rb',
+                                              block_size=SFTP_BLOCK_SIZE,
+                                              max_requests=max_requests) as remote_file:
+                # 파일 크기만큼은 파이프라인을 채워 요청하고, 그 뒤에는 한 블록만 요청하여 EOF 확인
+                # (크기가 0으로 보고되는 /proc, FIFO 등이나 읽는 중에 커진 파일도 끝까지 읽음)
+                remaining = (await remote_file.stat()).size or 0
+                while True:
+                    probing = remaining <= 0
+                    request_size = SFTP_BLOCK_SIZE if probing else min(SFTP_CHUNK_SIZE, remaining)
+                    chunk = await remote_file.read(request_size)
+                    if not chunk:
+                        break
+                    parts.append(decoder.decode(chunk))
+                    remaining -= len(chunk)
+                    
+                    # 확인용 요청에 블록이 가득 차서 왔다면 데이터가 더 있으므로 다시 파이프라인을 채워 요청하고,
+                    # 요청보다 짧게 왔다면 EOF에 가까우므로 다음에는 한 블록만 요청
+                    if len(chunk) < request_size:
+                        remaining = 0
+                    elif probing:
+                        remaining = SFTP_CHUNK_SIZE
+            parts.append(decoder.decode(b'', final=True))
+            content = ''.join(parts)
             
             # MIME 타입 추측
-            mime_type, _ = mimetypes.guess_type(str(full_path))
-            return content, mime_type or "text/plain"
+            return content, _guess_mime_type(full_path.name)
             
-        except FileNotFoundError:
+        except asyncssh.SFTPNoSuchFile:
             raise FileNotFoundError(f"File not found: {path}")
-        except PermissionError:
+        except asyncssh.SFTPPermissionDenied:
             raise PermissionError(f"Permission denied: {path}")
         except Exception as e:
             raise Exception(f"Error reading file {path}: {str(e)}")
     
+    async def remote_read_files(self, paths: List[str]) -> List[tuple[str, str] | BaseException]:
+        """여러 원격 파일을 동시에 읽기 (실패한 파일은 해당 위치에 예외를 반환)"""
+        semaphore = asyncio.Semaphore(READ_FILES_CONCURRENCY)
+        # 동시에 읽는 파일 수로 SFTP_MAX_REQUESTS를 나눠 쓰므로, 파일이 적으면 파일마다 더 많이 요청
+        max_requests = max(1, SFTP_MAX_REQUESTS // max(1, min(len(paths), READ_FILES_CONCURRENCY)))
+        
+        async def read_one(path: str) -> tuple[str, str]:
+            async with semaphore:
+                return await self.remote_read_file(path, max_requests=max_requests)
+        
+        # 파일마다 열기/닫기 왕복을 기다리지 않고 요청을 한꺼번에 보내되,
+        # 전체 READ 요청 수는 파일 하나를 읽을 때와 같은 SFTP_MAX_REQUESTS 이내로 유지
+        return await asyncio.gather(*(read_one(path) for path in paths), return_exceptions=True)
+    
     async def remote_write_file(self, path: str, content: str) -> None:
         """원격 파일 쓰기"""
-        await self.remote_connect()
+        client = await self.remote_connect()
         full_path = self._validate_path(path)
         
         try:
-            # 원격 파일에 내용 쓰기
-            with io.BytesIO(content.encode('utf-8')) as temp_file:
-                await asyncio.to_thread(self._sftp_client.putfo, temp_file, str(full_path))
+            # 전체를 한 번에 인코딩하지 않고 청크 단위로 인코딩하면서 원격 파일에 쓰기
+            # (str 슬라이스는 코드 포인트를 나누지 않으므로 청크마다 따로 인코딩해도 됨)
+            async with client.sftp.open(str(full_path), 'wb',
+                                              block_size=SFTP_BLOCK_SIZE,
+                                              max_requests=SFTP_MAX_REQUESTS) as remote_file:
+                for start in range(0, len(content), SFTP_CHUNK_SIZE):
+                    await remote_file.write(content[start:start + SFTP_CHUNK_SIZE].encode('utf-8'))
+            
+            await self._invalidate_path(str(full_path))
                 
-        except PermissionError:
+        except asyncssh.SFTPPermissionDenied:
             raise PermissionError(f"Permission denied: {path}")
         except Exception as e:
             raise Exception(f"Error writing file {path}: {str(e)}")
     
-    async def remote_list_directory(self, path: str = "") -> List[dict]:
-        """원격 디렉토리 내용 나열"""
-        await self.remote_connect()
+    @staticmethod
+    def _entry_to_item(path: str, entry: asyncssh.SFTPName) -> dict:
+        """SFTP 디렉토리 항목을 목록 결과 형식으로 변환"""
+        attrs = entry.attrs
+        is_dir = stat.S_ISDIR(attrs.permissions)
+        item_path = posixpath.join(path, entry.filename) if path else entry.filename
         
-        if path == "":
-            full_path = self.base_path
-        else:
-            full_path = self._validate_path(path)
+        return {
+            "name": entry.filename,
+            "path": item_path,
+            "type": "directory" if is_dir else "file",
+            "size": attrs.size if not is_dir else None,
+            "permissions": attrs.permissions,
+            "modified": attrs.mtime
+        }
+    
+    async def _exec_list_entries(self, client: PooledConnection, dir_path: str) -> Optional[list]:
+        """원격 find 명령 한 번으로 디렉토리 항목 조회 (실패하면 None)"""
+        command = (
+            f"find {shlex.quote(dir_path)} -mindepth 1 -maxdepth 1 "
+            f"-printf '%y\\t%m\\t%s\\t%T@\\t%f\\0' 2>/dev/null"
+        )
+        result = await client.conn.run(command, check=False)
+        if result.exit_status != 0:
+            return None
+        
+        # 이름에 줄바꿈이 있어도 깨지지 않도록 NUL로 레코드를 구분
+        entries = []
+        for record in result.stdout.split('\0'):
+            fields = record.split('\t', 4)
+            
+            # 마지막 빈 레코드는 제외
+            if len(fields) != 5:
+                continue
+            
+            file_type, mode, size, mtime, name = fields
+            attrs = asyncssh.SFTPAttrs(
+                permissions=_FIND_TYPE_BITS.get(file_type, 0) | int(mode, 8),
+                size=int(size),
+                mtime=int(float(mtime))
+            )
+            entries.append(asyncssh.SFTPName(filename=name, attrs=attrs))
+            
+        return entries
+    
+    async def remote_list_directory(self, path: str = "") -> AsyncIterator[dict]:
+        """원격 디렉토리 내용을 서버에서 도착하는 대로 나열"""
+        client = await self.remote_connect()
+        
+        dir_path = str(self._validate_path(path)) if path else self._base_str
         
         try:
-            # 원격 디렉토리 내용 가져오기
-            attr_list = await asyncio.to_thread(self._sftp_client.listdir_attr, str(full_path))
+            # 캐시가 유효하면 원격 디렉토리를 다시 읽지 않음
+            entries = await self._get_cached_dir(dir_path)
+            if entries is not None:
+                for entry in entries:
+                    yield self._entry_to_item(path, entry)
+                return
             
-            items = []
-            for attr in attr_list:
-                is_dir = stat.S_ISDIR(attr.st_mode)
-                item_path = str(Path(path) / attr.filename) if path else attr.filename
-                
-                items.append({
-                    "name": attr.filename,
-                    "path": item_path,
-                    "type": "directory" if is_dir else "file",
-                    "size": attr.st_size if not is_dir else None,
-                    "permissions": attr.st_mode,
-                    "modified": attr.st_mtime
-                })
-                
-            return items
+            # 큰 디렉토리는 SFTP READDIR 왕복 대신 원격 명령 한 번으로 나열
+            if self._dir_sizes.get(dir_path, 0) >= EXEC_LISTING_THRESHOLD:
+                entries = await self._exec_list_entries(client, dir_path)
+                if entries is not None:
+                    await self._store_dir(dir_path, entries)
+                    for entry in entries:
+                        yield self._entry_to_item(path, entry)
+                    return
             
-        except FileNotFoundError:
+            # 항목을 받는 즉시 전달하고, 끝까지 읽은 목록만 캐시에 저장
+            entries = []
+            async for entry in client.sftp.scandir(dir_path):
+                if entry.filename in ('.', '..'):
+                    continue
+                entries.append(entry)
+                yield self._entry_to_item(path, entry)
+            await self._store_dir(dir_path, entries)
+            
+        except asyncssh.SFTPNoSuchFile:
             raise FileNotFoundError(f"Directory not found: {path}")
-        except PermissionError:
+        except asyncssh.SFTPPermissionDenied:
             raise PermissionError(f"Permission denied: {path}")
         except Exception as e:
             raise Exception(f"Error listing directory {path}: {str(e)}")
     
-    async def remote_search_files(self, pattern: str, path: str = "") -> List[dict]:
-        """원격 파일 검색"""
-        base_dir = path if path else str(self.base_path)
-        results = []
+    async def _search_cached_tree(self, base_dir: str, name_re: re.Pattern) -> Optional[list]:
+        """캐시된 디렉토리 트리에서 이름 검색 (캐시가 하위 트리 전체를 담고 있지 않으면 None)"""
+        matches = []
+        pending = [(base_dir, "")]
+        
+        while pending:
+            dir_path, rel_dir = pending.pop()
+            entries = await self._get_cached_dir(dir_path)
+            if entries is None:
+                return None
+            
+            for entry in entries:
+                mode = entry.attrs.permissions
+                is_dir = stat.S_ISDIR(mode)
+                rel_path = f"{rel_dir}/{entry.filename}" if rel_dir else entry.filename
+                
+                # find -type f -o -type d와 동일하게 일반 파일과 디렉토리만 대상으로 함
+                if is_dir:
+                    pending.append((f"{dir_path.rstrip('/')}/{entry.filename}", rel_path))
+                elif not stat.S_ISREG(mode):
+                    continue
+                
+                if name_re.match(entry.filename):
+                    matches.append((rel_path, is_dir, entry.attrs.size))
+                    
+        return matches
+    
+    @staticmethod
+    def _find_errors(result: asyncssh.SSHCompletedProcess) -> List[str]:
+        """실패한 find의 오류 메시지 중 권한 오류를 제외한 것 (성공했으면 빈 목록)"""
+        if result.exit_status == 0:
+            return []
+        return [line for line in result.stderr.splitlines() if 'Permission denied' not in line]
+    
+    async def _search_remote(self, base_dir: str, pattern: str) -> list:
+        """원격 find 명령으로 이름 검색"""
+        # find 명령어 한 번으로 타입, 크기, 상대 경로를 함께 가져옴
+        # (이름에 줄바꿈이 있어도 깨지지 않도록 NUL로 레코드를 구분)
+        command = (
+            f"LC_ALL=C find {shlex.quote(base_dir)} -name {shlex.quote(f'*{pattern}*')} "
+            f"\\( -type f -o -type d \\) -printf '%y\\t%s\\t%P\\0'"
+        )
         
-        # find 명령어를 사용하여 원격에서 파일 검색
-        command = f"find {base_dir} -name '*{pattern}*' -type f -o -name '*{pattern}*' -type d 2>/dev/null"
+        client = await self.remote_connect()
+        result = await client.conn.run(command, check=False)
         
-        await self.remote_connect()
-        _, stdout, _ = await asyncio.to_thread(self._ssh_client.exec_command, command)
-        output = await asyncio.to_thread(stdout.read)
-        file_list = output.decode('utf-8').splitlines()
+        # -printf를 지원하지 않는 find(BSD/macOS 등)는 이름만 받아 SFTP stat으로 처리
+        if not result.stdout and self._find_errors(result):
+            return await self._search_remote_portable(client, base_dir, pattern)
         
-        for file_path in file_list:
-            if not file_path.strip():
+        matches = []
+        for record in result.stdout.split('\0'):
+            fields = record.split('\t', 2)
+            
+            # 마지막 빈 레코드와 검색 시작 디렉토리 자체는 제외
+            if len(fields) != 3 or not fields[2]:
                 continue
+            
+            file_type, size, rel_path = fields
+            matches.append((rel_path, file_type == 'd', int(size)))
+            
+        return matches
+    
+    async def _search_remote_portable(self, client: PooledConnection, base_dir: str, pattern: str) -> list:
+        """-printf 없이 POSIX find로 이름을 찾고 SFTP stat으로 타입과 크기 조회"""
+        command = (
+            f"LC_ALL=C find {shlex.quote(base_dir)} -name {shlex.quote(f'*{pattern}*')} "
+            f"\\( -type f -o -type d \\) -print0"
+        )
+        result = await client.conn.run(command, check=False)
+        
+        errors = self._find_errors(result)
+        if not result.stdout and errors:
+            raise Exception(f"Error searching files in {base_dir}: {errors[0]}")
+        
+        file_paths = [
+            file_path for file_path in result.stdout.split('\0')
+            if file_path and file_path != base_dir
+        ]
+        # 한 채널에서 파이프라이닝되도록 stat 요청을 한꺼번에 보냄
+        stats = await asyncio.gather(
+            *(client.sftp.stat(file_path) for file_path in file_paths),
+            return_exceptions=True
+        )
+        
+        matches = []
+        for file_path, attrs in zip(file_paths, stats):
+            # 권한 문제 등으로 접근할 수 없는 파일은 무시
+            if isinstance(attrs, Exception):
+                continue
+            
+            is_dir = stat.S_ISDIR(attrs.permissions)
+            matches.append((file_path[len(base_dir):].lstrip('/'), is_dir, attrs.size))
+            
+        return matches
+    
+    async def remote_directory_mtime(self, path: str = "") -> int:
+        """원격 디렉토리의 수정 시각 조회 (항목이 추가/삭제/이름 변경되면 바뀜)"""
+        client = await self.remote_connect()
+        dir_path = str(self._validate_path(path)) if path else self._base_str
+        
+        try:
+            mtime = (await client.sftp.stat(dir_path)).mtime
+        except asyncssh.SFTPNoSuchFile:
+            raise FileNotFoundError(f"Directory not found: {path}")
+        except asyncssh.SFTPPermissionDenied:
+            raise PermissionError(f"Permission denied: {path}")
+        
+        # 마지막으로 확인한 이후 바뀌었다면 TTL이 남아 있어도 캐시된 목록을 버림
+        async with self._cache_lock:
+            if self._dir_mtimes.get(dir_path) != mtime:
+                self._dir_cache.pop(dir_path, None)
+                self._dir_mtimes[dir_path] = mtime
                 
-            try:
-                stat_info = await asyncio.to_thread(self._sftp_client.stat, file_path)
-                is_dir = stat.S_ISDIR(stat_info.st_mode)
-                
-                # 경로를 상대 경로로 변환하기 위한 처리
-                rel_path = file_path
-                if str(self.base_path) != "/":
-                    rel_path = file_path[len(str(self.base_path)):].lstrip('/')
-                
-                results.append({
-                    "name": os.path.basename(file_path),
-                    "path": rel_path,
-                    "type": "directory" if is_dir else "file",
-                    "size": stat_info.st_size if not is_dir else None
-                })
-            except Exception:
-                # 권한 문제 등으로 접근할 수 없는 파일은 무시
-                pass
-                
-        return results
+        return mtime
+    
+    async def remote_search_files(self, pattern: str, path: str = "") -> List[dict]:
+        """원격 파일 검색"""
+        base_dir = str(self._validate_path(path)) if path else self._base_str
+        
+        # 검색 범위가 모두 캐시되어 있으면 원격 호출 없이 캐시에서 검색
+        matches = await self._search_cached_tree(base_dir, _compile_name_pattern(pattern))
+        if matches is None:
+            matches = await self._search_remote(base_dir, pattern)
+        
+        # 결과 경로는 base_path 기준 상대 경로 (base_path가 /이면 절대 경로)
+        if self._base_str == "/":
+            prefix = base_dir
+        else:
+            prefix = base_dir[len(self._base_str):].lstrip('/')
+        
+        return [
+            {
+                "name": posixpath.basename(rel_path),
+                "path": posixpath.join(prefix, rel_path) if prefix else rel_path,
+                "type": "directory" if is_dir else "file",
+                "size": size if not is_dir else None
+            }
+            for rel_path, is_dir, size in matches
+        ]
     
     async def remote_execute_command(self, command: str) -> tuple[str, str]:
         """원격 서버에서 명령어 실행"""
-        await self.remote_connect()
-        _, stdout, stderr = await asyncio.to_thread(self._ssh_client.exec_command, command)
+        client = await self.remote_connect()
+        # stdout과 stderr를 동시에 수집하여 한쪽 파이프가 가득 차도 멈추지 않도록 함
+        result = await client.conn.run(command, check=False)
         
-        out = await asyncio.to_thread(stdout.read)
-        err = await asyncio.to_thread(stderr.read)
+        # 임의의 명령어는 파일 시스템을 변경할 수 있으므로 캐시를 비움
+        await self._invalidate_all()
         
-        return out.decode('utf-8'), err.decode('utf-8')
+        return result.stdout, result.stderr
 
 
 class RemoteSSHFileServer:
@@ -234,24 +622,36 @@ class RemoteSSHFileServer:
         """
         self.fs = RemoteSSHFileSystemManager(**ssh_config)
         self.server = Server("remote-ssh-file-server")
+        # list_resources 결과 캐시 (기본 디렉토리 수정 시각, 리소스 목록)
+        self._resources_cache: Optional[tuple[int, list[Resource]]] = None
     
     def setup_handlers(self):
         """MCP 핸들러 설정"""
         @self.server.list_resources()
         async def list_resources() -> list[Resource]:
-            items = await self.fs.remote_list_directory()
-            return [
+            # 기본 디렉토리가 바뀌지 않았으면 이전에 만든 리소스 목록을 그대로 반환
+            mtime = await self.fs.remote_directory_mtime()
+            cached = self._resources_cache
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            
+            # 반복문 안에서의 속성 조회를 피하기 위해 지역 변수로 바인딩
+            host = self.fs.hostname
+            guess_mime_type = _guess_mime_type
+            resources = [
                 Resource(
-                    uri=f"ssh://{self.fs.hostname}/{item['path']}",
+                    uri=f"ssh://{host}/{item['path']}",
                     name=item['name'],
                     mimeType=(
                         "inode/directory" if item['type'] == "directory" 
-                        else mimetypes.guess_type(item['name'])[0] or "text/plain"
+                        else guess_mime_type(item['name'])
                     ),
                     description=f"{'Directory' if item['type'] == 'directory' else 'File'}: {item['path']}"
                 )
-                for item in items
+                async for item in self.fs.remote_list_directory()
             ]
+            self._resources_cache = (mtime, resources)
+            return resources
         
         @self.server.read_resource()
         async def read_resource(uri: str) -> str:
@@ -260,101 +660,103 @@ class RemoteSSHFileServer:
             content, _ = await self.fs.remote_read_file(path)
             return content
         
+        # 도구 목록은 바뀌지 않으므로 한 번만 생성하여 재사용
+        self._tool_list = [
+            Tool(
+                name="remote_write_file",
+                description="원격 파일 작성",
+                inputSchema=WRITE_FILE_SCHEMA
+            ),
+            Tool(
+                name="remote_read_files",
+                description="여러 원격 파일을 한 번에 읽기",
+                inputSchema=READ_FILES_SCHEMA
+            ),
+            Tool(
+                name="remote_search_files",
+                description="원격 파일 검색",
+                inputSchema=SEARCH_FILES_SCHEMA
+            ),
+            Tool(
+                name="remote_list_directory",
+                description="원격 디렉토리 내용 나열",
+                inputSchema=LIST_DIRECTORY_SCHEMA
+            ),
+            Tool(
+                name="remote_execute_command",
+                description="원격 서버에서 명령어 실행",
+                inputSchema=EXECUTE_COMMAND_SCHEMA
+            )
+        ]
+        
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
-            return [
-                Tool(
-                    name="remote_write_file",
-                    description="원격 파일 작성",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string"},
-                            "content": {"type": "string"}
-                        },
-                        "required": ["path", "content"]
-                    }
-                ),
-                Tool(
-                    name="remote_search_files",
-                    description="원격 파일 검색",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "pattern": {"type": "string"},
-                            "path": {"type": "string"}
-                        },
-                        "required": ["pattern"]
-                    }
-                ),
-                Tool(
-                    name="remote_list_directory",
-                    description="원격 디렉토리 내용 나열",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string"}
-                        }
-                    }
-                ),
-                Tool(
-                    name="remote_execute_command",
-                    description="원격 서버에서 명령어 실행",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "command": {"type": "string"}
-                        },
-                        "required": ["command"]
-                    }
-                )
-            ]
+            return self._tool_list
+        
+        # 도구 이름 -> 처리 함수 (요청마다 if/elif 비교를 하지 않도록 한 번만 구성)
+        self._dispatch = {
+            "remote_write_file": self._handle_write_file,
+            "remote_read_files": self._handle_read_files,
+            "remote_search_files": self._handle_search_files,
+            "remote_list_directory": self._handle_list_directory,
+            "remote_execute_command": self._handle_execute_command,
+        }
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-            if name == "remote_write_file":
-                await self.fs.remote_write_file(
-                    arguments["path"],
-                    arguments["content"]
-                )
-                return [TextContent(
-                    type="text",
-                    text=f"원격 파일 작성 완료: {arguments['path']}"
-                )]
-                
-            elif name == "remote_search_files":
-                path = arguments.get("path", "")
-                results = await self.fs.remote_search_files(arguments["pattern"], path)
-                return [TextContent(
-                    type="text",
-                    text="\n".join(
-                        f"[{r['type']}] {r['path']}"
-                        for r in results
-                    ) or "일치하는 파일이 없습니다."
-                )]
-                
-            elif name == "remote_list_directory":
-                path = arguments.get("path", "")
-                results = await self.fs.remote_list_directory(path)
-                return [TextContent(
-                    type="text",
-                    text="\n".join(
-                        f"[{r['type']}] {r['path']} ({r['size'] if r['size'] else 'DIR'})"
-                        for r in results
-                    ) or "디렉토리가 비어있거나 접근할 수 없습니다."
-                )]
-                
-            elif name == "remote_execute_command":
-                out, err = await self.fs.remote_execute_command(arguments["command"])
-                
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"실행 결과:\n{out}\n\n오류(있는 경우):\n{err}"
-                    )
-                ]
-                
-            raise ValueError(f"알 수 없는 도구: {name}")
+            handler = self._dispatch.get(name)
+            if handler is None:
+                raise ValueError(f"알 수 없는 도구: {name}")
+            return await handler(arguments)
+    
+    async def _handle_write_file(self, arguments: dict) -> list[TextContent]:
+        """remote_write_file 도구 처리"""
+        path = arguments["path"]
+        await self.fs.remote_write_file(path, arguments["content"])
+        # 수정 시각 해상도(초) 안에 일어난 변경도 놓치지 않도록 직접 비움
+        self._resources_cache = None
+        return [TextContent(type="text", text=f"원격 파일 작성 완료: {path}")]
+    
+    async def _handle_read_files(self, arguments: dict) -> list[TextContent]:
+        """remote_read_files 도구 처리"""
+        paths = arguments["paths"]
+        results = await self.fs.remote_read_files(paths)
+        return [
+            TextContent(
+                type="text",
+                text=f"=== {path} ===\n{result[0]}" if not isinstance(result, BaseException)
+                else f"=== {path} ===\n읽기 실패: {result}"
+            )
+            for path, result in zip(paths, results)
+        ]
+    
+    async def _handle_search_files(self, arguments: dict) -> list[TextContent]:
+        """remote_search_files 도구 처리"""
+        results = await self.fs.remote_search_files(arguments["pattern"], arguments.get("path", ""))
+        return [TextContent(
+            type="text",
+            text="\n".join(
+                f"[{r['type']}] {r['path']}"
+                for r in results
+            ) or NO_MATCHING_FILES_TEXT
+        )]
+    
+    async def _handle_list_directory(self, arguments: dict) -> list[TextContent]:
+        """remote_list_directory 도구 처리"""
+        path = arguments.get("path", "")
+        return [TextContent(
+            type="text",
+            text="\n".join([
+                f"[{r['type']}] {r['path']} ({r['size'] if r['size'] else 'DIR'})"
+                async for r in self.fs.remote_list_directory(path)
+            ]) or EMPTY_DIRECTORY_TEXT
+        )]
+    
+    async def _handle_execute_command(self, arguments: dict) -> list[TextContent]:
+        """remote_execute_command 도구 처리"""
+        out, err = await self.fs.remote_execute_command(arguments["command"])
+        self._resources_cache = None
+        return [TextContent(type="text", text=f"실행 결과:\n{out}\n\n오류(있는 경우):\n{err}")]
 
 
 async def main():
@@ -366,13 +768,14 @@ async def main():
     parser.add_argument('--password', type=str, help='SSH 비밀번호')
     parser.add_argument('--key-file', type=str, help='SSH 키 파일 경로')
     parser.add_argument('--base-path', type=str, default='/', help='기본 작업 디렉토리')
+    parser.add_argument('--pool-size', type=int, default=4, help='유지할 SSH 연결 수')
     
     args = parser.parse_args()
     
     # 설정 파일에서 SSH 정보 로드
     if args.config:
-        with open(args.config, 'r') as f:
-            ssh_config = json.load(f)
+        config_bytes = Path(args.config).read_bytes()
+        ssh_config = orjson.loads(config_bytes) if orjson else json.loads(config_bytes)
     else:
         # 명령줄 인수에서 SSH 정보 설정
         ssh_config = {
@@ -381,7 +784,8 @@ async def main():
             'username': args.username,
             'password': args.password,
             'key_filename': args.key_file,
-            'base_path': args.base_path
+            'base_path': args.base_path,
+            'pool_size': args.pool_size
         }
     
     # 필수 정보 확인
@@ -399,7 +803,7 @@ async def main():
     server.setup_handlers()
     
     try:
-        print(f"원격 SSH MCP 서버 시작: {ssh_config['hostname']}:{ssh_config.get('port', 22)}")
+        print(f"원격 SSH MCP 서버 시작: {ssh_config['hostname']}:{ssh_config.get('port', 22)}", file=sys.stderr)
         
         # stdio_server 컨텍스트 매니저 사용
         from mcp.server.stdio import stdio_server